@@ -1,17 +1,31 @@
 # Strict typing imports
 from typing import Dict, Any
-import json
+
+# Prefer orjson's Rust parser for the join-key payload; fall back to stdlib json.
+try:
+    import orjson
+
+    def _loads(s: str) -> Any:
+        return orjson.loads(s.encode() if isinstance(s, str) else s)
+except ImportError:
+    import json
+    _loads = json.loads
 
 # Library imports
 import streamlit as st
 
 # Local application imports
 from rag_context_debugger.config import ConfigError
-from rag_context_debugger.tecton_client import TectonDebuggerClient
 from rag_context_debugger.mock_client import MockTectonDebuggerClient
 from rag_context_debugger.analysis import analyze_retrieved_context, AnalysisResult
 from rag_context_debugger.ui_components import display_visual_summary, display_context_details
 
+@st.cache_data(show_spinner=False)
+def _analyze_mock_context(service_name: str, query: str, join_keys: Dict[str, Any]) -> AnalysisResult:
+    """Fetches and analyzes a mock context vector, memoized across Streamlit reruns."""
+    feature_vector = MockTectonDebuggerClient().fetch_context_vector(service_name, join_keys, {"query": query})
+    return analyze_retrieved_context(feature_vector)
+
 def main() -> None:
     st.set_page_config(layout="wide", page_title="RAG Diagnostic Engine")
     st.title("RAG Diagnostic Engine")
@@ -58,12 +72,19 @@ def main() -> None:
 
     if st.button("Analyze Context", type="primary", use_container_width=True):
         try:
-            join_keys: Dict[str, Any] = json.loads(join_keys_str)
+            join_keys: Dict[str, Any] = _loads(join_keys_str)
             
             with st.spinner("Retrieving and analyzing RAG context..."):
-                client: Any = MockTectonDebuggerClient() if use_mock else TectonDebuggerClient()
-                feature_vector = client.fetch_context_vector(service_name, join_keys, {"query": query})
-                analysis: AnalysisResult = analyze_retrieved_context(feature_vector)
+                analysis: AnalysisResult
+                if use_mock:
+                    # Mock vectors are deterministic, so repeated clicks replay the cached analysis
+                    analysis = _analyze_mock_context(service_name, query, join_keys)
+                else:
+                    # Only import tecton_client when not in mock mode
+                    from rag_context_debugger.tecton_client import TectonDebuggerClient
+                    client = TectonDebuggerClient()
+                    feature_vector = client.fetch_context_vector(service_name, join_keys, {"query": query})
+                    analysis = analyze_retrieved_context(feature_vector)
 
             st.success("Analysis Complete!")
 
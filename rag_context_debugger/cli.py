@@ -1,10 +1,24 @@
 import json
 from typing import Dict, Any, Optional
 import click
-from .config import config, ConfigError
-from .mock_client import MockTectonDebuggerClient
-from .analysis import analyze_retrieved_context, AnalysisResult
-from .ui_components import format_cli_report
+
+# Prefer orjson's Rust parser for --join-keys; fall back to stdlib json.
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both.
+try:
+    import orjson
+
+    def _loads(s: str) -> Any:
+        return orjson.loads(s.encode() if isinstance(s, str) else s)
+except ImportError:
+    _loads = json.loads
+
+from .config import ConfigError
+
+# Styled run-mode labels, rendered once per process instead of on every run
+_STYLED_MODES: Dict[bool, str] = {
+    True: click.style("MOCK", bold=True),
+    False: click.style("LIVE", bold=True),
+}
 
 @click.command()
 @click.option('--status', help='The Tecton Feature status for RAG. Required for mock mode, optional for live mode.')
@@ -13,8 +27,15 @@ from .ui_components import format_cli_report
 @click.option('--query', default="How do I reset my password?", help='The user query to diagnose. (Optional, has default)')
 @click.option('--seed', type=int, help='Optional seed for deterministic mock output.')
 @click.option('--mock', is_flag=True, default=False, help='Run in mock mode.')
-def main(status: str, quality: str, join_keys: str, query: str, seed: Optional[int], mock: bool) -> None:
+@click.option('--quiet', is_flag=True, default=False, help='Suppress progress messages and print only the report.')
+@click.option('--max-chars', type=click.IntRange(min=0), default=2000, show_default=True, help='Truncate each chunk text to this many characters in the report; 0 prints chunks in full.')
+def main(status: str, quality: str, join_keys: str, query: str, seed: Optional[int], mock: bool, quiet: bool, max_chars: int) -> None:
     """RAG Diagnostic Engine - Production-ready context quality analysis."""
+    def progress(message: str) -> None:
+        """Echoes a progress line unless --quiet was given; errors are always printed."""
+        if not quiet:
+            click.echo(message)
+
     try:
         # Validate status/quality parameter based on mode
         if mock and not status and not quality:
@@ -26,17 +47,24 @@ def main(status: str, quality: str, join_keys: str, query: str, seed: Optional[i
         if quality:
             status = quality
         
-        if not mock and config is None:
-            raise ConfigError("To run in Live Mode, set Tecton env vars. Use --mock to simulate.")
+        if not mock:
+            # Only load .env configuration when live mode is requested
+            from .config import config
+            if config is None:
+                raise ConfigError("To run in Live Mode, set Tecton env vars. Use --mock to simulate.")
 
-        join_keys_dict: Dict[str, Any] = json.loads(join_keys)
+        join_keys_dict: Dict[str, Any] = _loads(join_keys)
+        
+        # Deferred so --help and argument/JSON errors return without loading the analysis stack
+        from .mock_client import MockTectonDebuggerClient
+        from .analysis import analyze_retrieved_context, AnalysisResult
+        from .ui_components import format_cli_report
         
-        mode = "MOCK" if mock else "LIVE"
-        click.echo(f"Running in {click.style(mode, bold=True)} mode.")
+        progress(f"Running in {_STYLED_MODES[mock]} mode.")
         
         if mock:
-            click.echo(f"Mock Status: {click.style(status, bold=True)}")
-        click.echo(f"Diagnosing Query: {click.style(query, bold=True)}")
+            progress(f"Mock Status: {click.style(status, bold=True)}")
+        progress(f"Diagnosing Query: {click.style(query, bold=True)}")
         
         if mock:
             client = MockTectonDebuggerClient()
@@ -45,7 +73,7 @@ def main(status: str, quality: str, join_keys: str, query: str, seed: Optional[i
             from .tecton_client import TectonDebuggerClient
             client = TectonDebuggerClient()
         
-        click.echo("Fetching context vector...")
+        progress("Fetching context vector...")
         # For live mode, status might be None, so we need to handle that
         request_data: Dict[str, Any] = {"query": query}
         if seed is not None:
@@ -57,7 +85,7 @@ def main(status: str, quality: str, join_keys: str, query: str, seed: Optional[i
             # In live mode, status is not used by the real client
             feature_vector = client.fetch_context_vector("", join_keys_dict, request_data)
         
-        click.echo("Analyzing context...")
+        progress("Analyzing context...")
         analysis: AnalysisResult = analyze_retrieved_context(feature_vector)
 
         # Check for analysis errors
@@ -66,9 +94,9 @@ def main(status: str, quality: str, join_keys: str, query: str, seed: Optional[i
             click.secho(f"Analysis Error: {error}", fg="red", err=True)
             return
 
-        click.echo("Generating report...")
+        progress("Generating report...")
         # The CLI formatter is now responsible for all console output.
-        report = format_cli_report(analysis)
+        report = format_cli_report(analysis, max_chars=max_chars or None)
         click.echo(report)
 
     except json.JSONDecodeError:
@@ -1,9 +1,5 @@
 import os
-from typing import Optional
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+from typing import Any, Optional
 
 class ConfigError(Exception):
     """Custom exception for configuration-related errors."""
@@ -28,24 +24,50 @@ class Config:
         Raises:
             ConfigError: If any of the required environment variables are not set.
         """
-        self.tecton_url = os.environ.get("TECTON_URL", "")
-        self.api_key = os.environ.get("TECTON_API_KEY", "")
-        self.workspace_name = os.environ.get("TECTON_WORKSPACE", "")
-        self.api_service = os.environ.get("API_SERVICE", "")
+        env = os.environ
+        tecton_url = env.get("TECTON_URL", "")
+        api_key = env.get("TECTON_API_KEY", "")
+        workspace_name = env.get("TECTON_WORKSPACE", "")
+        api_service = env.get("API_SERVICE", "")
 
-        if not all([self.tecton_url, self.api_key, self.workspace_name, self.api_service]):
+        if not (tecton_url and api_key and workspace_name and api_service):
             raise ConfigError(
                 "Missing required environment variables. "
                 "Please set TECTON_URL, TECTON_API_KEY, TECTON_WORKSPACE, and API_SERVICE."
             )
 
+        self.tecton_url = tecton_url
+        self.api_key = api_key
+        self.workspace_name = workspace_name
+        self.api_service = api_service
+
 # --- Global Config Instance ---
-# A single, globally accessible config object is instantiated.
-# A try-except block handles the case where the script is imported in an
-# environment without the variables set (e.g., during linting or docs generation),
+# A single, globally accessible config object is built lazily on first access
+# (e.g. `from .config import config`), so importing this module does no .env
+# filesystem lookups; paths that never touch the config (--help, mock mode) skip it.
+# It is None when the variables are not set (e.g., during linting or docs generation),
 # preventing a crash on import. The error will be caught at runtime instead.
 config: Optional[Config]
-try:
-    config = Config()
-except ConfigError:
-    config = None
\ No newline at end of file
+
+_REQUIRED_ENV_VARS = ("TECTON_URL", "TECTON_API_KEY", "TECTON_WORKSPACE", "API_SERVICE")
+
+def _load_config() -> Optional[Config]:
+    """Loads the .env file and builds the global Config, or returns None if it is incomplete."""
+    # load_dotenv() never overrides existing variables, so skip its filesystem
+    # search when the shell or container already provides all of them
+    if not all(name in os.environ for name in _REQUIRED_ENV_VARS):
+        from dotenv import load_dotenv
+
+        # Load environment variables from .env file
+        load_dotenv()
+    try:
+        return Config()
+    except ConfigError:
+        return None
+
+def __getattr__(name: str) -> Any:
+    """Builds the global config on first access and caches it as a real module attribute."""
+    if name == "config":
+        loaded = globals()["config"] = _load_config()
+        return loaded
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,11 +1,12 @@
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 import logging
+import re
 
-# Library imports
-from tecton.framework.workspace import Workspace, get_workspace
-from tecton.framework.data_frame import FeatureVector
-from tecton.framework.feature_service import FeatureService
-from tecton.identities.credentials import login
+# Library imports; the Tecton SDK itself is imported when a client is created
+if TYPE_CHECKING:
+    from tecton.framework.workspace import Workspace
+    from tecton.framework.data_frame import FeatureVector
+    from tecton.framework.feature_service import FeatureService
 
 # Local application imports
 from .config import config, ConfigError
@@ -13,6 +14,19 @@ from .config import config, ConfigError
 # Configure logging for debugging and monitoring
 logger = logging.getLogger(__name__)
 
+def _phrase_pattern(*phrases: str) -> "re.Pattern[str]":
+    """Compiles phrases into one case-insensitive alternation that matches any of them as a substring."""
+    return re.compile("|".join(map(re.escape, phrases)), re.IGNORECASE)
+
+# Error categories, matched case-insensitively against the downstream error message.
+# Each pattern scans the message once without first copying it to lowercase.
+_NOT_FOUND_RE = _phrase_pattern("not found", "does not exist", "not exist")
+_SERVICE_DENIED_RE = _phrase_pattern("permission", "unauthorized", "access denied")
+_PERMISSION_RE = _phrase_pattern("permission", "unauthorized", "access denied", "forbidden")
+_INVALID_RE = _phrase_pattern("invalid", "malformed", "bad request", "400")
+_RATE_LIMIT_RE = _phrase_pattern("rate limit", "quota", "too many requests", "429")
+_SERVER_RE = _phrase_pattern("server", "network", "timeout", "connection", "500", "502", "503", "504")
+
 class TectonDebuggerClient:
     """
     A production-ready wrapper for the Tecton SDK to simplify fetching context vectors.
@@ -36,9 +50,12 @@ class TectonDebuggerClient:
         if config is None:
             raise ConfigError("Configuration not loaded. Check environment variables.")
         
+        from tecton.framework.workspace import get_workspace
+        from tecton.identities.credentials import login
+        
         # Step 1: Attempt to authenticate with Tecton
         try:
-            logger.debug(f"Attempting to authenticate with Tecton at {config.tecton_url}")
+            logger.debug("Attempting to authenticate with Tecton at %s", config.tecton_url)
             login(
                 config.tecton_url, 
                 interactive=False, 
@@ -46,7 +63,7 @@ class TectonDebuggerClient:
             )
             logger.debug("Tecton authentication successful")
         except Exception as auth_error:
-            logger.error(f"Tecton authentication failed: {auth_error}")
+            logger.error("Tecton authentication failed: %s", auth_error)
             raise ConnectionError(
                 f"Failed to authenticate with Tecton. Please verify your TECTON_URL and "
                 f"TECTON_API_KEY are correct and that your API key has not expired. "
@@ -55,11 +72,11 @@ class TectonDebuggerClient:
         
         # Step 2: Attempt to connect to the specified workspace
         try:
-            logger.debug(f"Attempting to connect to workspace: {config.workspace_name}")
-            self.workspace: Workspace = get_workspace(config.workspace_name)
-            logger.debug(f"Successfully connected to workspace: {config.workspace_name}")
+            logger.debug("Attempting to connect to workspace: %s", config.workspace_name)
+            self.workspace: "Workspace" = get_workspace(config.workspace_name)
+            logger.debug("Successfully connected to workspace: %s", config.workspace_name)
         except Exception as workspace_error:
-            logger.error(f"Workspace connection failed: {workspace_error}")
+            logger.error("Workspace connection failed: %s", workspace_error)
             raise ConnectionError(
                 f"Failed to connect to Tecton workspace '{config.workspace_name}'. "
                 f"Please verify the TECTON_WORKSPACE name is correct and that your "
@@ -71,7 +88,7 @@ class TectonDebuggerClient:
         service_name: str,
         join_keys: Dict[str, Any],
         request_data: Optional[Dict[str, Any]] = None
-    ) -> FeatureVector:
+    ) -> "FeatureVector":
         """
         Fetches the online feature vector for a given service and join keys.
 
@@ -99,22 +116,22 @@ class TectonDebuggerClient:
         
         # Step 4.1: Retrieve the Feature Service
         try:
-            logger.debug(f"Attempting to retrieve Feature Service: {service_name}")
-            feature_service: FeatureService = self.workspace.get_feature_service(service_name)
-            logger.debug(f"Successfully retrieved Feature Service: {service_name}")
+            logger.debug("Attempting to retrieve Feature Service: %s", service_name)
+            feature_service: "FeatureService" = self.workspace.get_feature_service(service_name)
+            logger.debug("Successfully retrieved Feature Service: %s", service_name)
         except Exception as service_error:
-            logger.error(f"Feature Service retrieval failed: {service_error}")
+            logger.error("Feature Service retrieval failed: %s", service_error)
             
             # Check for specific "not found" patterns in the error message
-            error_str = str(service_error).lower()
-            if any(phrase in error_str for phrase in ["not found", "does not exist", "not exist"]):
+            error_str = str(service_error)
+            if _NOT_FOUND_RE.search(error_str):
                 workspace_name = config.workspace_name if config else "unknown"
                 raise ValueError(
                     f"Feature Service '{service_name}' not found in workspace "
                     f"'{workspace_name}'. Please ensure the service name is "
                     f"correct and that the service exists in this workspace."
                 )
-            elif any(phrase in error_str for phrase in ["permission", "unauthorized", "access denied"]):
+            elif _SERVICE_DENIED_RE.search(error_str):
                 raise ConnectionError(
                     f"Access denied to Feature Service '{service_name}'. Your API key "
                     f"may not have permission to access this service. Please contact "
@@ -130,26 +147,26 @@ class TectonDebuggerClient:
         
         # Step 4.2: Fetch online features from the service
         try:
-            logger.debug(f"Attempting to fetch online features from service: {service_name}")
+            logger.debug("Attempting to fetch online features from service: %s", service_name)
             
             # Validate request_data is not None before passing
             safe_request_data = request_data if request_data is not None else {}
             
-            feature_vector: FeatureVector = feature_service.get_online_features(
+            feature_vector: "FeatureVector" = feature_service.get_online_features(
                 join_keys=join_keys,
                 request_data=safe_request_data
             )
             
-            logger.debug(f"Successfully retrieved feature vector with {len(join_keys)} join keys")
+            logger.debug("Successfully retrieved feature vector with %d join keys", len(join_keys))
             return feature_vector
             
         except Exception as features_error:
-            logger.error(f"Feature retrieval failed: {features_error}")
+            logger.error("Feature retrieval failed: %s", features_error)
             
-            error_str = str(features_error).lower()
+            error_str = str(features_error)
             
             # Authentication/Permission Errors
-            if any(phrase in error_str for phrase in ["permission", "unauthorized", "access denied", "forbidden"]):
+            if _PERMISSION_RE.search(error_str):
                 raise ConnectionError(
                     f"Permission denied while fetching features from '{service_name}'. "
                     f"Your API key may lack the required permissions for this specific "
@@ -157,7 +174,7 @@ class TectonDebuggerClient:
                 )
             
             # Invalid Argument Errors
-            elif any(phrase in error_str for phrase in ["invalid", "malformed", "bad request", "400"]):
+            elif _INVALID_RE.search(error_str):
                 raise ValueError(
                     f"Invalid request parameters for Feature Service '{service_name}'. "
                     f"Please check that your join_keys and request_data are properly "
@@ -165,7 +182,7 @@ class TectonDebuggerClient:
                 )
             
             # Rate Limiting or Quota Issues
-            elif any(phrase in error_str for phrase in ["rate limit", "quota", "too many requests", "429"]):
+            elif _RATE_LIMIT_RE.search(error_str):
                 raise RuntimeError(
                     f"Rate limit exceeded for Feature Service '{service_name}'. "
                     f"Please wait before retrying or contact your Tecton administrator "
@@ -173,7 +190,7 @@ class TectonDebuggerClient:
                 )
             
             # Server/Network Errors
-            elif any(phrase in error_str for phrase in ["server", "network", "timeout", "connection", "500", "502", "503", "504"]):
+            elif _SERVER_RE.search(error_str):
                 raise RuntimeError(
                     f"Tecton's server returned an error while fetching features from "
                     f"'{service_name}'. This may be a transient issue. Please try again "
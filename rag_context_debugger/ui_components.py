@@ -1,49 +1,154 @@
 import re
-import click
-from typing import List, Dict
-import streamlit as st
-import plotly.express as px  # type: ignore
-from .analysis import AnalysisResult, RetrievedChunk
+import html
+from collections import Counter
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Iterable, List, Dict, Optional, Tuple
+import numpy as np
+from .analysis import AnalysisResult
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go  # type: ignore
+
+# streamlit and plotly are imported inside the display_* renderers so the CLI,
+# which only needs format_cli_report, does not pay for loading them; likewise
+# click is only imported by the CLI styling helper below
+
+# (Streamlit, CLI) colors for each health status; any other status is shown in red.
+# The CLI uses yellow where Streamlit's palette has orange.
+_STATUS_PALETTE: Dict[str, Tuple[str, str]] = {
+    "HEALTHY": ("green", "green"),
+    "WARNING": ("orange", "yellow"),
+}
+_DEFAULT_STATUS_COLORS = ("red", "red")
+
+@lru_cache(maxsize=64)
+def _cli_style(text: str, fg: str, bold: Optional[bool] = None) -> str:
+    """ANSI-styles a CLI label, rendering each distinct label once per process."""
+    import click
+    return click.style(text, fg=fg, bold=bold)
 
 def _get_status_color(status: str) -> str:
-    return "green" if status == "HEALTHY" else ("orange" if status == "WARNING" else "red")
+    return _STATUS_PALETTE.get(status, _DEFAULT_STATUS_COLORS)[0]
 
-def _create_relevance_bar(score: float) -> str:
-    """Creates an HTML progress bar to visualize relevance score."""
-    color = "green" if score > 0.75 else ("orange" if score > 0.6 else "red")
-    return f"""
+# Static HTML for the chunk renderers, parsed once at import instead of per chunk
+_RELEVANCE_BAR_HTML = """
     <div style="background-color: #eee; border-radius: 5px; padding: 2px;">
-        <div style="width: {score*100}%; background-color: {color}; height: 20px; border-radius: 5px; text-align: center; color: white; font-weight: bold;">
+        <div style="width: {width}%; background-color: {color}; height: 20px; border-radius: 5px; text-align: center; color: white; font-weight: bold;">
             {score:.2f}
         </div>
     </div>
+    """.format
+_CHUNK_ROW_HTML = """
+    <hr>
+    <div style="display: flex; gap: 1rem;">
+        <div style="flex: 3;">
+            <p><strong>Chunk {number}</strong></p>
+            <div style="background-color:#f8f9fa; color: black; padding: 10px; border-radius: 5px;">{text}</div>
+        </div>
+        <div style="flex: 1;">
+            <p><strong>Relevance</strong></p>
+            {bar}
+        </div>
+    </div>
+    """.format
+_MARK_OPEN = '<mark style="background-color: #FFDDAA; padding: 2px 0px; border-radius: 3px;">'
+_MARK_CLOSE = '</mark>'
+_HIGHLIGHT_MAX_CHARS = 30_000
+
+def _create_relevance_bars(scores: List[float]) -> List[str]:
+    """Creates the HTML progress bars visualizing a run of relevance scores."""
+    # Pick every bar color in one vectorized pass over the scores
+    values = np.asarray(scores, dtype=np.float64)
+    colors: List[str] = np.where(values > 0.75, "green", np.where(values > 0.6, "orange", "red")).tolist()
+    return [
+        _RELEVANCE_BAR_HTML(width=score * 100, color=color, score=score)
+        for score, color in zip(scores, colors)
+    ]
+
+@lru_cache(maxsize=32)
+def _compile_phrases(phrases: Tuple[str, ...]) -> Optional["re.Pattern[str]"]:
+    """Compiles phrases into one case-insensitive alternation, or None if there are no phrases."""
+    if not phrases:
+        return None
+    # Longest first, so a phrase wins over any shorter phrase it starts with
+    ordered = sorted(phrases, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, ordered)), re.IGNORECASE)
+
+def _highlight_text(text: str, pattern: Optional["re.Pattern[str]"]) -> str:
+    """
+    HTML-escapes a block of text and highlights every match of a compiled phrase pattern.
+    
+    Matches are found on the raw text in one scan, and the escaped slices between them
+    are spliced together with the <mark> markup in a single join.
     """
+    # Oversized chunks are shown unhighlighted to bound the per-chunk render cost
+    if pattern is None or len(text) > _HIGHLIGHT_MAX_CHARS:
+        return html.escape(text)
+    
+    parts: List[str] = []
+    last = 0
+    for match in pattern.finditer(text):
+        start, end = match.span()
+        parts += (html.escape(text[last:start]), _MARK_OPEN, html.escape(match.group()), _MARK_CLOSE)
+        last = end
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
 
-def _highlight_text(text: str, phrases: List[str]) -> str:
-    """Highlights a list of phrases in a block of text."""
-    for phrase in phrases:
-        # Use regex to find whole words/phrases only, case-insensitive
-        text = re.sub(f"({re.escape(phrase)})", r'<mark style="background-color: #FFDDAA; padding: 2px 0px; border-radius: 3px;">\1</mark>', text, flags=re.IGNORECASE)
-    return text
+# Key-phrase candidates: runs of 4+ word characters, without surrounding punctuation
+_KEY_PHRASE_TOKEN_RE = re.compile(r"\w{4,}")
+_KEY_PHRASE_TOKEN_BYTES_RE = re.compile(rb"\w{4,}")
 
-def _extract_key_phrases(chunks: List[RetrievedChunk]) -> List[str]:
-    """Extract key phrases from chunks for highlighting."""
-    if not chunks:
-        return []
+@lru_cache(maxsize=32)
+def _extract_key_phrases(texts: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Extract key phrases from chunk texts for highlighting, memoized per retrieval."""
+    # A phrase must appear in at least 2 chunks, so fewer chunks can never yield one
+    if len(texts) < 2:
+        return ()
+    
+    # Only consider words longer than 3 characters; the tokenizer filters them in C.
+    # All-ASCII retrievals (the common case) are lowercased and scanned as bytes, which
+    # are smaller and faster to scan than str; \w and lower() agree on ASCII either way.
+    token_lists: Iterable[List[Any]]
+    if all(text.isascii() for text in texts):
+        token_lists = (_KEY_PHRASE_TOKEN_BYTES_RE.findall(text.encode('ascii').lower()) for text in texts)
+    else:
+        token_lists = (_KEY_PHRASE_TOKEN_RE.findall(text.lower()) for text in texts)
     
-    # Simple approach: extract common words that appear in multiple chunks
-    word_counts: Dict[str, int] = {}
-    for chunk in chunks:
-        words = chunk['text'].lower().split()
-        for word in words:
-            if len(word) > 3:  # Only consider words longer than 3 characters
-                word_counts[word] = word_counts.get(word, 0) + 1
+    # Simple approach: extract common words that appear in multiple chunks.
+    # Each chunk contributes a word once (dict.fromkeys dedups in first-seen order),
+    # so the count is the number of chunks containing the word.
+    chunk_counts: Counter[Any] = Counter()
+    for tokens in token_lists:
+        chunk_counts.update(dict.fromkeys(tokens, 1))
     
-    # Return words that appear in at least 2 chunks
-    return [word for word, count in word_counts.items() if count >= 2][:10]
+    # Return words that appear in at least 2 chunks, decoded back to str for highlighting
+    phrases = [word for word, count in chunk_counts.items() if count >= 2][:10]
+    return tuple(word.decode('ascii') if isinstance(word, bytes) else word for word in phrases)
+
+@lru_cache(maxsize=32)
+def _build_relevance_chart(scores: Tuple[float, ...]) -> "go.Figure":
+    """
+    Builds the relevance bar chart for a tuple of chunk scores.
+    
+    Figures are memoized per scores tuple and shared between reruns; callers must not mutate them.
+    """
+    import plotly.graph_objects as go  # type: ignore
+
+    # Bars sit at integer positions; only the tick text carries the "Chunk N" labels
+    positions = np.arange(1, len(scores) + 1)
+    return go.Figure(
+        data=[go.Bar(x=positions, y=np.array(scores, dtype=np.float64))],
+        layout=go.Layout(
+            title="Relevance Scores by Chunk",
+            xaxis={"title": "Chunk", "tickvals": positions, "ticktext": [f"Chunk {i}" for i in range(1, len(scores) + 1)]},
+            yaxis={"title": "Relevance Score", "range": [0, 1]},
+        ),
+    )
 
 def display_visual_summary(analysis: AnalysisResult) -> None:
     """Renders the main diagnostic summary with metrics."""
+    import streamlit as st
+
     report = analysis.get('health_report', {})
     status = report.get('status', 'UNKNOWN')
     color = _get_status_color(status)
@@ -64,16 +169,8 @@ def display_visual_summary(analysis: AnalysisResult) -> None:
         chunks = analysis.get('retrieved_chunks', [])
         if chunks:
             # Create a simple bar chart of relevance scores
-            scores = [chunk['score'] for chunk in chunks]
-            labels = [f"Chunk {i+1}" for i in range(len(chunks))]
-            
-            fig = px.bar(  # type: ignore
-                x=labels, y=scores,
-                title="Relevance Scores by Chunk",
-                labels={'x': 'Chunk', 'y': 'Relevance Score'}
-            )
-            fig.update_layout(yaxis_range=[0, 1])  # type: ignore
-            st.plotly_chart(fig, use_container_width=True)  # type: ignore
+            fig = _build_relevance_chart(tuple(chunk['score'] for chunk in chunks))
+            st.plotly_chart(fig, use_container_width=True, key="relevance_bar")  # type: ignore
         else:
             st.info("No chunks available for visualization.")
     
@@ -96,6 +193,8 @@ def display_visual_summary(analysis: AnalysisResult) -> None:
 
 def display_context_details(analysis: AnalysisResult) -> None:
     """Renders the detailed, annotated context chunks."""
+    import streamlit as st
+
     st.header("Retrieved Context Details")
     chunks = analysis.get('retrieved_chunks', [])
     
@@ -103,39 +202,47 @@ def display_context_details(analysis: AnalysisResult) -> None:
         st.warning("No context was retrieved.")
         return
 
-    # Extract key phrases for highlighting
-    key_phrases = _extract_key_phrases(chunks)
-
-    for i, chunk in enumerate(chunks):
-        st.markdown(f"---")
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.markdown(f"**Chunk {i+1}**")
-            highlighted_text = _highlight_text(chunk['text'], key_phrases)
-            st.markdown(f'<div style="background-color:#f8f9fa; color: black; padding: 10px; border-radius: 5px;">{highlighted_text}</div>', unsafe_allow_html=True)
-        with col2:
-            st.markdown(f"**Relevance**")
-            st.html(_create_relevance_bar(chunk['score']))
-
-def format_cli_report(analysis: AnalysisResult) -> str:
-    """Formats the full analysis result into a string for CLI output."""
-    report_parts: List[str] = []
+    # Extract key phrases for highlighting, compiled once and shared by every chunk
+    key_phrases = _extract_key_phrases(tuple(chunk['text'] for chunk in chunks))
+    phrase_pattern = _compile_phrases(key_phrases)
+
+    bars = _create_relevance_bars([chunk['score'] for chunk in chunks])
+
+    # Emit every chunk row in one HTML element rather than several Streamlit elements per chunk
+    st.html("".join(
+        _CHUNK_ROW_HTML(number=i, text=_highlight_text(chunk['text'], phrase_pattern), bar=bar)
+        for i, (chunk, bar) in enumerate(zip(chunks, bars), 1)
+    ))
+
+def _truncate_chunk_text(text: str, max_chars: Optional[int]) -> str:
+    """Cuts text to max_chars with a marker noting how much was dropped; None keeps it whole."""
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [truncated {len(text) - max_chars} chars]"
+
+def format_cli_report(analysis: AnalysisResult, max_chars: Optional[int] = 2000) -> str:
+    """
+    Formats the full analysis result into a string for CLI output.
+    
+    Chunk texts longer than max_chars are truncated; pass None to print them in full.
+    """
     report = analysis.get('health_report', {})
     status = report.get('status', 'UNKNOWN')
-    color = "green" if status == "HEALTHY" else ("yellow" if status == "WARNING" else "red")
+    styled_status = _cli_style(status, _STATUS_PALETTE.get(status, _DEFAULT_STATUS_COLORS)[1], bold=True)
 
-    report_parts.append(f"\n--- Context Quality Report ---")
-    report_parts.append(f"Status: {click.style(status, fg=color, bold=True)}")
-    report_parts.append(f"Diagnosis: {report['message']}")
-    report_parts.append(
+    # The fixed report header is built as one list display rather than appended line by line
+    report_parts: List[str] = [
+        "\n--- Context Quality Report ---",
+        f"Status: {styled_status}",
+        f"Diagnosis: {report['message']}",
         f"Chunks: {report['chunk_count']} | "
         f"Avg. Relevance: {report['avg_relevance_score']:.2f} | "
-        f"Diversity: {report['semantic_diversity_score']:.2f}"
-    )
+        f"Diversity: {report['semantic_diversity_score']:.2f}",
+    ]
     
     # Add answer surface information
+    report_parts.append(_cli_style("\n--- Generated Answer ---", "green"))
     if analysis.get('generated_answer'):
-        report_parts.append(click.style("\n--- Generated Answer ---", fg="green"))
         report_parts.append(analysis.get('generated_answer', ''))
         
         confidence = analysis.get('answer_confidence')
@@ -144,19 +251,18 @@ def format_cli_report(analysis: AnalysisResult) -> str:
         else:
             report_parts.append("Answer Confidence: n/a")
     else:
-        report_parts.append(click.style("\n--- Generated Answer ---", fg="green"))
-        report_parts.append("(none)")
-        report_parts.append("Answer Confidence: n/a")
+        report_parts += ("(none)", "Answer Confidence: n/a")
 
-    report_parts.append(click.style("\n--- Retrieved Context Chunks ---", fg="cyan"))
+    report_parts.append(_cli_style("\n--- Retrieved Context Chunks ---", "cyan"))
     chunks = analysis.get('retrieved_chunks', [])
     if not chunks:
         report_parts.append("No context was retrieved.")
     else:
-        for i, chunk in enumerate(chunks):
-            report_parts.append(f"Chunk {i+1} | Score: {chunk['score']:.2f}")
-            # Indent the text for readability
-            report_parts.append(f"  > {chunk['text']}")
+        # Header line plus indented text for readability, one entry per chunk
+        report_parts.extend(
+            f"Chunk {i} | Score: {chunk['score']:.2f}\n  > {_truncate_chunk_text(chunk['text'], max_chars)}"
+            for i, chunk in enumerate(chunks, 1)
+        )
 
     report_parts.append("\n")
     return "\n".join(report_parts)
\ No newline at end of file